@@ -113,7 +113,12 @@ class LeastSquares:
         """
         if roi is None:
             roi = (0, x.size)
-        fit = least_squares(cls.errors, np.zeros(max_order + 1),
+        # The model is linear in the coefficients, the Jacobian of the residuals
+        # is the Vandermonde matrix, which doesn't change between iterations.
+        # least_squares rescales the returned Jacobian in place for robust
+        # losses, hand it a fresh copy every time
+        vander = np.vander(x[roi[0]:roi[1]], max_order + 1)
+        fit = least_squares(cls.errors, np.zeros(max_order + 1), jac=lambda *args: vander.copy(),
                             loss=loss, args=(x, y, roi), xtol=xtol, ftol=ftol)
         r_sq = 1 - np.sum(cls.errors(fit.x, x, y, roi)**2) / np.sum((y[roi[0]:roi[1]].mean() - y[roi[0]:roi[1]])**2)
         if np.linalg.det(fit.jac.T.dot(fit.jac)):
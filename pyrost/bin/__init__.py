@@ -10,7 +10,8 @@ from .simulation import (next_fast_len, gaussian_kernel, gaussian_filter,
 from .pyrost import (make_reference, update_pixel_map_gs,
                      update_pixel_map_nm, update_translations_gs,
                      mse_frame, mse_total, ct_integrate)
-from .pyfftw import FFTW, empty_aligned, zeros_aligned, ones_aligned
+from .pyfftw import (FFTW, empty_aligned, zeros_aligned, ones_aligned,
+                     export_wisdom, import_wisdom, forget_wisdom)
 
 del locals()['simulation']
 del locals()['pyrost']
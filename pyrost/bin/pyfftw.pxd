@@ -124,6 +124,12 @@ cdef extern from 'fftw3.h':
     void fftw_cleanup()
     void fftw_cleanup_threads()
 
+    # wisdom functions
+    char *fftw_export_wisdom_to_string()
+    int fftw_import_wisdom_from_string(const char *input_string)
+    int fftw_import_system_wisdom()
+    void fftw_forget_wisdom()
+
     double FFTW_NO_TIMELIMIT
 
 # Define function pointers that can act as a placeholder
@@ -540,6 +540,10 @@ _build_set_timelimit_funcs_list()
 
 fftw_init_threads()
 
+# Reuse the plans measured on this machine before, if any. Only the
+# double precision wisdom is loaded, the only precision planned here
+fftw_import_system_wisdom()
+
 Py_AtExit(_cleanup)
 
 # Helper functions
@@ -1769,3 +1773,56 @@ cdef class FFTW:
         cdef fftw_generic_execute fftw_execute = self._fftw_execute
         with nogil:
             fftw_execute(plan, input_pointer, output_pointer)
+
+def export_wisdom():
+    '''export_wisdom()
+
+    Return the FFTW wisdom accumulated in the current session as
+    a byte string.
+
+    The wisdom holds the plans measured so far and can be restored
+    with :func:`import_wisdom` in a later session, skipping the
+    costly planning with ``'FFTW_MEASURE'`` or ``'FFTW_PATIENT'``
+    flags. The plans made by the C routines of pyrost use the wisdom
+    as well.
+
+    Only the double precision wisdom is exported. Unlike pyFFTW,
+    which returns a tuple of the double, single, and long double
+    wisdom, pyrost is linked against the double precision FFTW
+    library only, and :class:`FFTW` plans ``float64`` and
+    ``complex128`` transforms only.
+    '''
+    cdef char *c_wisdom
+    with plan_lock:
+        c_wisdom = fftw_export_wisdom_to_string()
+    if c_wisdom is NULL:
+        raise MemoryError('not enough memory')
+    try:
+        py_wisdom = <bytes>c_wisdom
+    finally:
+        free(c_wisdom)
+    return py_wisdom
+
+def import_wisdom(wisdom):
+    '''import_wisdom(wisdom)
+
+    Import the double precision FFTW wisdom exported with
+    :func:`export_wisdom`.
+
+    Returns True if the wisdom was successfully imported, False
+    otherwise.
+    '''
+    cdef bytes b_wisdom = wisdom
+    cdef int success
+    with plan_lock:
+        success = fftw_import_wisdom_from_string(b_wisdom)
+    return bool(success)
+
+def forget_wisdom():
+    '''forget_wisdom()
+
+    Forget all the double precision FFTW wisdom accumulated in the
+    current session.
+    '''
+    with plan_lock:
+        fftw_forget_wisdom()
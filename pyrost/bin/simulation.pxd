@@ -48,6 +48,7 @@ cdef extern from "median.h":
     int compare_float(void *a, void *b) nogil
     int compare_int(void *a, void *b) nogil
     int compare_uint(void *a, void *b) nogil
+    int compare_ushort(void *a, void *b) nogil
 
     int median_c "median" (void *out, void *data, unsigned char *mask, int ndim, unsigned long *dims,
                  unsigned long item_size, int axis, int (*compar)(void*, void*), unsigned threads) nogil
@@ -749,6 +749,8 @@ def median(data: np.ndarray, mask: np.ndarray=None, axis: cython.int=0,
             fail = median_c(_out, _data, _mask, ndim, _dims, 4, axis, compare_int, num_threads)
         elif type_num == np.NPY_UINT32:
             fail = median_c(_out, _data, _mask, ndim, _dims, 4, axis, compare_uint, num_threads)
+        elif type_num == np.NPY_UINT16:
+            fail = median_c(_out, _data, _mask, ndim, _dims, 2, axis, compare_ushort, num_threads)
         else:
             raise TypeError('data argument has incompatible type: {:s}'.format(data.dtype))
     if fail:
@@ -833,6 +835,8 @@ def median_filter(data: np.ndarray, size: object, mask: np.ndarray=None, mode: s
             fail = median_filter_c(_out, _data, _mask, ndim, _dims, 4, _fsize, _mode, _cval, compare_int, num_threads)
         elif type_num == np.NPY_UINT32:
             fail = median_filter_c(_out, _data, _mask, ndim, _dims, 4, _fsize, _mode, _cval, compare_uint, num_threads)
+        elif type_num == np.NPY_UINT16:
+            fail = median_filter_c(_out, _data, _mask, ndim, _dims, 2, _fsize, _mode, _cval, compare_ushort, num_threads)
         else:
             raise TypeError('data argument has incompatible type: {:s}'.format(data.dtype))
     if fail:
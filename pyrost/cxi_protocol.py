@@ -26,6 +26,7 @@ Or generate the default CXI loader:
 """
 import os
 import configparser
+from contextlib import ExitStack
 import h5py
 import numpy as np
 from .ini_parser import ROOT_PATH, INIParser
@@ -180,6 +181,15 @@ class CXIProtocol(INIParser):
         return attr in self.default_paths
 
     def _read_from_dset(self, attr, dset, idxs=None, dtype=None):
+        if idxs is None and self._is_direct(attr, dset, dtype):
+            # Read straight into a buffer of the target type, HDF5 converts
+            # the data on the fly without an intermediate copy
+            data = np.empty(dset.shape, dtype=self.get_dtype(attr, dtype))
+            dset.read_direct(data)
+            return data
+        if np.ndim(idxs) == 1 and np.asarray(idxs).dtype.kind in 'iu' and \
+           np.all(np.asarray(idxs) >= 0) and self._is_direct(attr, dset, dtype):
+            return self._read_runs(attr, dset, np.asarray(idxs), dtype)
         if idxs is None:
             data = dset[()]
         else:
@@ -190,6 +200,42 @@ class CXIProtocol(INIParser):
             data = data.astype(self.get_dtype(attr, dtype))
         return data
 
+    def _read_from_group(self, attr, group, idxs=None, dtype=None):
+        dsets = list(group.values())
+        if not isinstance(idxs, list):
+            idxs = [idxs,] * len(dsets)
+        if dsets and all(didxs is None and dset.shape == dsets[0].shape and
+                         self._is_direct(attr, dset, dtype)
+                         for dset, didxs in zip(dsets, idxs)):
+            # Read every dataset straight into its slice of the output
+            data = np.empty((len(dsets),) + dsets[0].shape, dtype=self.get_dtype(attr, dtype))
+            for index, dset in enumerate(dsets):
+                dset.read_direct(data, dest_sel=np.s_[index])
+            return data
+        return np.stack([self._read_from_dset(attr, dset, didxs, dtype)
+                         for dset, didxs in zip(dsets, idxs)])
+
+    def _is_direct(self, attr, dset, dtype=None):
+        dtype = np.dtype(self.get_dtype(attr, dtype))
+        return dset.size > 1 and dset.dtype.kind in 'iuf' and dtype.kind in 'iuf'
+
+    def _read_runs(self, attr, dset, idxs, dtype=None):
+        # Issue a single read per run of consecutive indices instead of
+        # a fancy-indexed read, which h5py performs element by element
+        order = np.argsort(idxs, kind='stable')
+        sorted_idxs = idxs[order]
+        bounds = np.concatenate(([0,], np.flatnonzero(np.diff(sorted_idxs) != 1) + 1,
+                                 [idxs.size,]))
+        data = np.empty((idxs.size,) + dset.shape[1:], dtype=self.get_dtype(attr, dtype))
+        for start, stop in zip(bounds[:-1], bounds[1:]):
+            if start < stop:
+                dset.read_direct(data, np.s_[sorted_idxs[start]:sorted_idxs[stop - 1] + 1],
+                                 np.s_[start:stop])
+        if np.any(order[1:] < order[:-1]):
+            # Restore the requested order of the frames
+            data = data[np.argsort(order)]
+        return data
+
     def get_default_path(self, attr, value=None):
         """Return the atrribute's default path in the CXI file.
         Return `value` if `attr` is not found.
@@ -290,12 +336,7 @@ class CXIProtocol(INIParser):
             if isinstance(cxi_obj, h5py.Dataset):
                 return self._read_from_dset(attr, cxi_obj, idxs, dtype)
             elif isinstance(cxi_obj, h5py.Group):
-                if isinstance(idxs, list):
-                    return np.stack([self._read_from_dset(attr, dset, didxs, dtype)
-                                     for dset, didxs in zip(cxi_obj.values(), idxs)])
-                else:
-                    return np.stack([self._read_from_dset(attr, dset, idxs, dtype)
-                                     for dset in cxi_obj.values()])
+                return self._read_from_group(attr, cxi_obj, idxs, dtype)
             else:
                 raise ValueError(f"Invalid CXI object at '{cxi_path:s}'")
         else:
@@ -394,6 +435,7 @@ class CXILoader(CXIProtocol):
                  'policy': ('ALL', )}
     fmt_dict = {'config': 'str','datatypes': 'str', 'default_paths': 'str',
                 'load_paths': 'str', 'policy': 'str'}
+    true_flags = frozenset(['True', 'true', '1', 'y', 'yes'])
 
     def __init__(self, protocol=None, load_paths=None, policy=None):
         if protocol is None:
@@ -527,7 +569,7 @@ class CXILoader(CXIProtocol):
         """
         policy = self.policy.get(attr, value)
         if isinstance(policy, str):
-            return policy in ['True', 'true', '1', 'y', 'yes']
+            return policy in self.true_flags
         else:
             return bool(policy)
 
@@ -582,18 +624,23 @@ class CXILoader(CXIProtocol):
         """
         if not isinstance(path, str):
             raise ValueError('path must be a string')
-        attrs = list(self)
-        attrs.remove('data')
-        attr_dict = {}
         with h5py.File(path, 'r') as cxi_file:
-            for attr in attrs:
-                if attr in attributes and not attributes[attr] is None:
-                    attr_dict[attr] = np.asarray(attributes[attr], dtype=self.get_dtype(attr))
-                elif self.get_policy(attr, False):
-                    cxi_path = self.find_path(attr, cxi_file)
-                    attr_dict[attr] = self.read_cxi(attr, cxi_file, cxi_path=cxi_path)
-                else:
-                    attr_dict[attr] = None
+            return self._read_attributes(cxi_file, **attributes)
+
+    def _read_attributes(self, cxi_file, **attributes):
+        # Resolve the loading policy of all the attributes at once
+        policy = {attr for attr in self.policy if self.get_policy(attr, False)}
+        attr_dict = {}
+        for attr in self.default_paths:
+            if attr == 'data':
+                continue
+            if attr in attributes and not attributes[attr] is None:
+                attr_dict[attr] = np.asarray(attributes[attr], dtype=self.get_dtype(attr))
+            elif attr in policy:
+                cxi_path = self.find_path(attr, cxi_file)
+                attr_dict[attr] = self.read_cxi(attr, cxi_file, cxi_path=cxi_path)
+            else:
+                attr_dict[attr] = None
         if attr_dict.get('defocus'):
             attr_dict['defocus_ss'] = attr_dict['defocus']
             attr_dict['defocus_fs'] = attr_dict['defocus']
@@ -655,6 +702,35 @@ class CXILoader(CXIProtocol):
                                            cxi_path=cxi_path)
         return data
 
+    def load_frames(self, data_files):
+        """Retrieve the main data arrays from the CXI files and
+        stack them along the frames axis.
+
+        Parameters
+        ----------
+        data_files : str or list of str
+            Paths to the data CXI files.
+
+        Returns
+        -------
+        numpy.ndarray
+            Frames from all the files in `data_files`, stacked in
+            the order of the files.
+
+        Notes
+        -----
+        The stack is allocated once and every file is read straight
+        into its slice, the per-file arrays are not kept in memory.
+        """
+        if isinstance(data_files, (str, list)):
+            if isinstance(data_files, str):
+                data_files = [data_files,]
+        else:
+            raise ValueError('data_files must be a string or a list of strings')
+        with ExitStack() as stack:
+            cxi_files = [stack.enter_context(h5py.File(path, 'r')) for path in data_files]
+            return self._read_frames(cxi_files)
+
     def load_to_dict(self, paths, **attributes):
         """Load CXI files and return a :class:`dict` with
         all the data fetched from the files.
@@ -672,16 +748,42 @@ class CXILoader(CXIProtocol):
         dict
             Dictionary with all the data fetched from the CXI files.
         """
-        data_dict = {}
         if isinstance(paths, str):
-            data_dict.update(self.load_attributes(paths, **attributes))
-        elif isinstance(paths, list):
-            data_dict.update(self.load_attributes(paths[0], **attributes))
-        else:
+            paths = [paths,]
+        elif not isinstance(paths, list):
             raise ValueError('paths must be a string or a list of strings')
-        data_dict['data'] = np.concatenate(list(self.load_data(paths).values()), axis=-3)
+        with ExitStack() as stack:
+            # Open every file once for the attributes, the shapes, and the data
+            cxi_files = [stack.enter_context(h5py.File(path, 'r')) for path in paths]
+            data_dict = self._read_attributes(cxi_files[0], **attributes)
+            data_dict['data'] = self._read_frames(cxi_files)
         return data_dict
 
+    def _read_frames(self, cxi_files):
+        cxi_paths = [self.find_path('data', cxi_file) for cxi_file in cxi_files]
+        shapes = [self.read_shape('data', cxi_file, cxi_path)
+                  for cxi_file, cxi_path in zip(cxi_files, cxi_paths)]
+        if not all(isinstance(shape, tuple) and len(shape) >= 3 and
+                   shape[:-3] + shape[-2:] == shapes[0][:-3] + shapes[0][-2:]
+                   for shape in shapes):
+            return np.concatenate([self.read_cxi('data', cxi_file, cxi_path=cxi_path)
+                                   for cxi_file, cxi_path in zip(cxi_files, cxi_paths)],
+                                  axis=-3)
+
+        # Preallocate the stack and stream the frames of every file
+        # into its slice instead of concatenating per-file arrays
+        n_frames = np.cumsum([0,] + [shape[-3] for shape in shapes])
+        shape = shapes[0][:-3] + (n_frames[-1],) + shapes[0][-2:]
+        data = np.empty(shape, dtype=self.get_dtype('data'))
+        for cxi_file, cxi_path, lo, hi in zip(cxi_files, cxi_paths, n_frames[:-1],
+                                              n_frames[1:]):
+            dset = cxi_file[cxi_path]
+            if self._is_direct('data', dset):
+                dset.read_direct(data, dest_sel=np.s_[..., lo:hi, :, :])
+            else:
+                data[..., lo:hi, :, :] = dset[()]
+        return data
+
     def load(self, path, **attributes):
         """Load a CXI file and return an :class:`STData` class object.
 
@@ -5,34 +5,49 @@ import numpy as np
 class dict_to_object:
     def __init__(self, finstance):
         self.finstance = finstance
+        # Signature attributes don't depend on the instance, fetch them once
+        self.sig = (finstance.__annotations__, finstance.__doc__, finstance.__module__,
+                    finstance.__name__, finstance.__qualname__)
 
     def __get__(self, instance, cls):
-        return return_obj_method(self.finstance.__get__(instance, cls), instance, cls)
-
-class return_obj_method:
-    sig_attrs = {'__annotations__', '__doc__', '__module__',
-                 '__name__', '__qualname__'}
-
-    def __init__(self, func, instance, cls):
-        self.instance, self.cls = instance, cls
-        self.__wrapped__ = func
-        for attr in self.sig_attrs:
-            self.__dict__[attr] = getattr(func, attr)
-
-    def __call__(self, *args, **kwargs):
-        dct = {}
-        for key, val in self.instance.items():
-            if isinstance(val, np.ndarray):
-                dct[key] = np.copy(val)
-            else:
-                dct[key] = val
-        dct.update(self.__wrapped__(*args, **kwargs))
-        return self.cls(**dct)
-
-    def inplace_update(self, *args, **kwargs):
-        dct = self.__wrapped__(*args, **kwargs)
-        for key, val in dct.items():
-            self.instance.__setattr__(key, val)
+        func = self.finstance.__get__(instance, cls)
+
+        def method(*args, **kwargs):
+            dct = func(*args, **kwargs)
+            # Copy only the datasets which are not replaced by the method
+            return cls(**{key: np.copy(val) if isinstance(val, np.ndarray) else val
+                          for key, val in instance.items() if not key in dct}, **dct)
+
+        def inplace_update(*args, **kwargs):
+            for key, val in func(*args, **kwargs).items():
+                instance.__setattr__(key, val)
+
+        (method.__annotations__, method.__doc__, method.__module__,
+         method.__name__, method.__qualname__) = self.sig
+        # The wrapper is built on every access, caching it in the instance
+        # would create a reference cycle and keep the container alive
+        method.__wrapped__, method.inplace_update = func, inplace_update
+        return method
+
+class attr_dict_method:
+    """Forward a container method to the method of the same name
+    of its `attr_dict` dictionary. The bound dictionary method is
+    returned on the instance access, the decorated function only
+    provides the name and the docstring.
+
+    Parameters
+    ----------
+    func : function
+        Method to forward.
+    """
+    def __init__(self, func):
+        self.func = func
+        self.__doc__ = func.__doc__
+
+    def __get__(self, instance, cls):
+        if instance is None:
+            return self.func
+        return getattr(instance.attr_dict, self.func.__name__)
 
 class DataContainer:
     """Abstract data container class.
@@ -44,28 +59,41 @@ class DataContainer:
 
     Attributes
     ----------
-    attr_set : set
+    attr_set : frozenset
         Set of attributes in the container which are necessary
         to initialize in the constructor.
-    init_set : set
+    init_set : frozenset
         Set of optional data attributes.
 
     Raises
     ------
     ValueError
         If an attribute specified in `attr_set` has not been provided.
+
+    Notes
+    -----
+    The data attributes are stored as regular instance attributes and
+    mirrored in `attr_dict`, which provides the dictionary interface
+    (`get`, `keys`, `items`, and `values`). Reading an attribute is
+    therefore as fast as for any Python object.
     """
-    attr_set, init_set = set(), set()
+    attr_set, init_set = frozenset(), frozenset()
+    _attr_names = frozenset()
+
+    def __init_subclass__(cls, **kwargs):
+        super(DataContainer, cls).__init_subclass__(**kwargs)
+        # Freeze the attribute sets declared by the subclass and merge
+        # them once per class instead of on every __init__
+        cls.attr_set, cls.init_set = frozenset(cls.attr_set), frozenset(cls.init_set)
+        cls._attr_names = cls.attr_set | cls.init_set
 
     def __init__(self, **kwargs):
-        self.__dict__['attr_dict'] = {key: None for key in self.attr_set | self.init_set}
-        for attr in self.attr_set:
-            if kwargs.get(attr) is None:
+        self.__dict__['attr_dict'] = dict.fromkeys(self._attr_names)
+        for attr in self._attr_names:
+            value = kwargs.get(attr)
+            if value is None and attr in self.attr_set:
                 raise ValueError('Attribute {:s} has not been provided'.format(attr))
-            else:
-                self.__setattr__(attr, kwargs.get(attr))
-        for attr in self.init_set:
-            self.__setattr__(attr, kwargs.get(attr))
+            self.__setattr__(attr, value)
 
     def __iter__(self):
         return self.attr_dict.__iter__()
@@ -73,24 +101,29 @@ class DataContainer:
     def __contains__(self, attr):
         return attr in self.attr_dict
 
-    def __getattr__(self, attr):
-        if attr in self:
-            return self.attr_dict[attr]
-        else:
-            raise AttributeError(attr + " doesn't exist")
+    @staticmethod
+    def _format(val):
+        if isinstance(val, np.ndarray):
+            return 'ndarray(shape={}, dtype={})'.format(val.shape, val.dtype)
+        return repr(val)
 
     def __repr__(self):
-        return self.attr_dict.__repr__()
+        # Summarise the arrays instead of printing their content
+        attrs = ', '.join('{:s}={:s}'.format(attr, self._format(self.attr_dict[attr]))
+                          for attr in sorted(self.attr_dict))
+        return '{:s}({:s})'.format(type(self).__name__, attrs)
 
     def __setattr__(self, attr, value):
+        # Data attributes are stored as regular instance attributes for
+        # fast access and mirrored in attr_dict for the dict-like interface
         if attr in self.attr_dict:
             self.attr_dict[attr] = value
-        else:
-            super(DataContainer, self).__setattr__(attr, value)
+        super(DataContainer, self).__setattr__(attr, value)
 
     def __str__(self):
-        return self.attr_dict.__str__()
+        return self.__repr__()
 
+    @attr_dict_method
     def get(self, attr, value=None):
         """Retrieve a dataset, return `value` if the attribute is not found.
 
@@ -109,6 +142,7 @@ class DataContainer:
         """
         return self.attr_dict.get(attr, value)
 
+    @attr_dict_method
     def keys(self):
         """Return the list of attributes stored in the container.
 
@@ -119,6 +153,7 @@ class DataContainer:
         """
         return self.attr_dict.keys()
 
+    @attr_dict_method
     def items(self):
         """Return (key, value) pairs of the datasets stored in the container.
 
@@ -129,6 +164,7 @@ class DataContainer:
         """
         return self.attr_dict.items()
 
+    @attr_dict_method
     def values(self):
         """Return the attributes' data stored in the container.
 
@@ -40,7 +40,24 @@ from .aberrations_fit import AberrationsFit
 from .data_container import DataContainer, dict_to_object
 from .bin import median, make_reference, update_pixel_map_gs, update_pixel_map_nm
 from .bin import update_translations_gs, mse_frame, mse_total, ct_integrate
-from .bin import gaussian_filter, fft_convolve
+from .bin import gaussian_filter
+
+def _bin_frames(arr, bin_ratio, where=True):
+    # Sum the pixels over bin_ratio x bin_ratio blocks in the last two axes
+    shape = (arr.shape[-2] // bin_ratio, arr.shape[-1] // bin_ratio)
+    blocks = arr[..., :shape[0] * bin_ratio, :shape[1] * bin_ratio].reshape(
+        arr.shape[:-2] + (shape[0], bin_ratio, shape[1], bin_ratio))
+    if not where is True:
+        where = where[..., :shape[0] * bin_ratio, :shape[1] * bin_ratio].reshape(blocks.shape)
+    return np.sum(blocks, axis=(-3, -1), where=where)
+
+def _boxcar_mean(arr, size, axis):
+    # Mean over the windows of `size` pixels, which lie inside the array
+    # along the `axis`, calculated with a running sum
+    arr = np.moveaxis(arr, axis, 0)
+    csum = np.zeros((arr.shape[0] + 1,) + arr.shape[1:])
+    np.cumsum(arr, axis=0, out=csum[1:])
+    return np.moveaxis((csum[size:-1] - csum[:-size - 1]) / size, 0, axis)
 
 class STData(DataContainer):
     """Speckle Tracking algorithm data container class.
@@ -114,12 +131,15 @@ class STData(DataContainer):
     def __init__(self, protocol, **kwargs):
         # Initialize protocol for the proper data type conversion in __setattr__
         self.__dict__['protocol'] = protocol
+        self.__dict__['_dtype_table'] = {attr: protocol.get_dtype(attr)
+                                         for attr in self._attr_names
+                                         if not protocol.get_dtype(attr) is None}
 
         # Initialize attr_dict
         super(STData, self).__init__(**kwargs)
 
         # Add protocol to the attr_dict in order to get the dict_update decorator working
-        self.__dict__['attr_dict']['protocol'] = protocol
+        self.attr_dict['protocol'] = protocol
 
         # Initialize init_set attributes
         self._init_dict()
@@ -134,12 +154,12 @@ class STData(DataContainer):
         if self.good_frames is None:
             self.good_frames = np.arange(self.data.shape[0])
         if self.mask is None:
-            self.mask = np.ones(self.data.shape)
+            self.mask = np.ones(self.data.shape, dtype=bool)
         if self.mask.shape == self.data.shape[1:]:
-            self.mask = np.tile(self.mask[None, :], (self.data.shape[0], 1, 1))
+            self.mask = np.broadcast_to(self.mask, self.data.shape).copy()
         if self.whitefield is None:
-            self.whitefield = median(data=self.data[self.good_frames],
-                                     mask=self.mask[self.good_frames], axis=0,
+            self.whitefield = median(data=self.data[self._frames],
+                                     mask=self.mask[self._frames], axis=0,
                                      num_threads=self.num_threads)
 
         # Set a pixel map, deviation angles, and phase
@@ -150,12 +170,17 @@ class STData(DataContainer):
         if self._isdefocus:
             # Set a pixel translations
             if self.pixel_translations is None:
-                self.pixel_translations = (self.translations[:, None] * self.basis_vectors).sum(axis=-1)
+                # Project the translations onto the basis vectors without
+                # an (N, 2, 3) temporary and update the array in place
+                pix_translations = np.einsum('ij,ikj->ik', self.translations,
+                                             self.basis_vectors)
                 mag = np.abs(self.distance / np.array([self.defocus_ss, self.defocus_fs]))
-                self.pixel_translations *= mag / (self.basis_vectors**2).sum(axis=-1)
+                pix_translations *= mag / np.einsum('ikj,ikj->ik', self.basis_vectors,
+                                                    self.basis_vectors)
                 # Remove first element to avoid losing precision of np.mean
-                self.pixel_translations -= self.pixel_translations[0]
-                self.pixel_translations -= self.pixel_translations.mean(axis=0)
+                pix_translations -= pix_translations[0]
+                pix_translations -= pix_translations.mean(axis=0)
+                self.pixel_translations = pix_translations
 
             # Flip pixel mapping if defocus is negative
             if self.defocus_ss < 0:
@@ -181,16 +206,32 @@ class STData(DataContainer):
         return not self.pixel_aberrations is None and not self.phase is None
 
     def __setattr__(self, attr, value):
-        if attr in self.attr_set | self.init_set:
-            dtype = self.protocol.get_dtype(attr)
-            if not dtype is None:
-                if isinstance(value, np.ndarray):
-                    value = np.array(value, dtype=dtype)
-                elif not value is None:
-                    value = dtype(value)
-            super(STData, self).__setattr__(attr, value)
-        else:
-            super(STData, self).__setattr__(attr, value)
+        dtype = self._dtype_table.get(attr)
+        if not dtype is None:
+            if isinstance(value, np.ndarray):
+                # The container owns its data, never keep a reference to the input
+                value = np.array(value, dtype=dtype)
+            elif not value is None:
+                value = dtype(value)
+        super(STData, self).__setattr__(attr, value)
+
+    @property
+    def _frames(self):
+        # Index a contiguous range of frames with a slice, which yields a view
+        # instead of a fancy-indexed copy. Derived on every access, so that
+        # in-place changes of good_frames are taken into account, the check
+        # is O(n_frames) and negligible next to the frame-sized reads
+        good_frames = self.good_frames
+        if not good_frames is None and good_frames.ndim == 1 and good_frames.size and \
+           np.all(np.diff(good_frames.astype(np.int64)) == 1):
+            return slice(good_frames[0], good_frames[-1] + 1)
+        return good_frames
+
+    @property
+    def _roi_index(self):
+        if self.roi is None:
+            return None
+        return (slice(self.roi[0], self.roi[1]), slice(self.roi[2], self.roi[3]))
 
     @dict_to_object
     def bin_data(self, bin_ratio=2):
@@ -207,16 +248,25 @@ class STData(DataContainer):
         -------
         STData
             New :class:`STData` object with binned `data`.
+
+        Notes
+        -----
+        The binned `data` is the mean of the unmasked pixels in
+        each `bin_ratio` x `bin_ratio` block, a binned pixel is
+        masked if all of the pixels in its block are masked. The
+        trailing rows and columns that don't fill a block are
+        discarded.
         """
-        data = self.data[:, ::bin_ratio, ::bin_ratio]
-        whitefield = self.whitefield[::bin_ratio, ::bin_ratio]
-        mask = self.mask[:, ::bin_ratio, ::bin_ratio]
+        counts = _bin_frames(self.mask, bin_ratio)
+        data = np.divide(_bin_frames(self.data, bin_ratio, where=self.mask), counts,
+                         out=np.zeros(counts.shape), where=counts > 0)
+        whitefield = _bin_frames(self.whitefield, bin_ratio) / bin_ratio**2
         data_dict = {'basis_vectors': bin_ratio * self.basis_vectors, 'data': data,
-                     'whitefield': whitefield, 'mask': mask, 'roi': self.roi // bin_ratio,
+                     'whitefield': whitefield, 'mask': counts > 0, 'roi': self.roi // bin_ratio,
                      'x_pixel_size': bin_ratio * self.x_pixel_size,
                      'y_pixel_size': bin_ratio * self.y_pixel_size}
         if self._isdefocus:
-            data_dict['pixel_translations'] = self.pixel_translations / bin_ratio,
+            data_dict['pixel_translations'] = self.pixel_translations / bin_ratio
         return data_dict
 
     @dict_to_object
@@ -254,10 +304,20 @@ class STData(DataContainer):
         roi = self.roi.copy()
         roi[2 * axis:2 * (axis + 1)] = np.arange(2)
 
-        data = np.zeros(self.data.shape, self.data.dtype)
-        data[self.good_frames, self.roi[0]:self.roi[1], self.roi[2]:self.roi[3]] = self.get('data') * self.get('mask')
-        return {'data': np.sum(data, axis=axis + 1, keepdims=True),
-                'whitefield': None, 'mask': None, 'roi': roi}
+        # Sum the masked ROI directly and scatter the sums into the
+        # output, so that no data-sized buffer is allocated. Index the
+        # datasets once, contiguous frames yield views instead of the
+        # copies returned by get
+        shape = list(self.data.shape)
+        shape[axis + 1] = 1
+        data = np.zeros(shape, self.data.dtype)
+        frames = self._frames
+        index = (frames,) + self._roi_index
+        subscripts = 'fij,fij->fj' if axis == 0 else 'fij,fij->fi'
+        lo, hi = self.roi[2 * (1 - axis):2 * (2 - axis)]
+        data.squeeze(axis=axis + 1)[frames, lo:hi] = \
+            np.einsum(subscripts, self.data[index], self.mask[index])
+        return {'data': data, 'whitefield': None, 'mask': None, 'roi': roi}
 
     @dict_to_object
     def mask_frames(self, good_frames=None):
@@ -342,25 +402,32 @@ class STData(DataContainer):
         STData
             New :class:`STData` object with the updated `mask`.
         """
-        data = self.get('data')
+        if not update in ('reset', 'multiply'):
+            raise ValueError('invalid update argument')
+        mask_full = self.mask.copy()
         if method == 'no-bad':
-            mask = np.ones((self.good_frames.size, self.roi[1] - self.roi[0],
-                            self.roi[3] - self.roi[2]), dtype=bool)
-        elif method == 'range-bad':
-            mask = (data >= vmin) & (data < vmax)
+            # Multiplying by an all-ones mask is a no-op, resetting
+            # doesn't need the new mask to be allocated
+            if update == 'reset':
+                mask_full[(self._frames,) + self._roi_index] = True
+            return {'mask': mask_full, 'whitefield': None}
+        data = self.get('data')
+        if method == 'range-bad':
+            mask = data >= vmin
+            mask &= data < vmax
         elif method == 'perc-bad':
-            offsets = (data - np.median(data))
-            mask = (offsets >= np.percentile(offsets, pmin)) & \
-                   (offsets <= np.percentile(offsets, pmax))
+            # Percentiles of the offsets from the median are the percentiles
+            # of the data shifted by the median, threshold the data directly
+            dmin, dmax = np.percentile(data, [pmin, pmax])
+            mask = data >= dmin
+            mask &= data <= dmax
         else:
-            ValueError('invalid method argument')
-        mask_full = self.mask.copy()
+            raise ValueError('invalid method argument')
         if update == 'reset':
-            mask_full[self.good_frames, self.roi[0]:self.roi[1], self.roi[2]:self.roi[3]] = mask
-            return {'mask': mask_full, 'whitefield': None}
-        if update == 'multiply':
-            mask_full[self.good_frames, self.roi[0]:self.roi[1], self.roi[2]:self.roi[3]] *= mask
-            return {'mask': mask_full, 'whitefield': None}
+            mask_full[(self._frames,) + self._roi_index] = mask
+        else:
+            mask_full[(self._frames,) + self._roi_index] &= mask
+        return {'mask': mask_full, 'whitefield': None}
 
     @dict_to_object
     def make_whitefield(self):
@@ -439,7 +506,7 @@ class STData(DataContainer):
         dev_ss -= dev_ss.mean()
         dev_fs -= dev_fs.mean()
         self.pixel_aberrations = np.zeros(self.pixel_map.shape)
-        self.pixel_aberrations[:, self.roi[0]:self.roi[1], self.roi[2]:self.roi[3]] = np.stack((dev_ss, dev_fs))
+        self.pixel_aberrations[(Ellipsis,) + self._roi_index] = np.stack((dev_ss, dev_fs))
 
         # Calculate magnification for fast and slow axes
         mag_ss = np.abs((self.distance + self.defocus_ss) / self.defocus_ss)
@@ -455,9 +522,9 @@ class STData(DataContainer):
                              self.x_pixel_size**2 / dist_fs / mag_fs * dev_fs)
         phase *= 2 * np.pi / self.wavelength
         self.phase = np.zeros(self.whitefield.shape)
-        self.phase[self.roi[0]:self.roi[1], self.roi[2]:self.roi[3]] = phase
+        self.phase[self._roi_index] = phase
         self.error_frame = np.zeros(self.whitefield.shape)
-        self.error_frame[self.roi[0]:self.roi[1], self.roi[2]:self.roi[3]] = st_obj.error_frame
+        self.error_frame[self._roi_index] = st_obj.error_frame
         self.reference_image = st_obj.reference_image
 
         # Initialize AberrationsFit objects
@@ -577,30 +644,39 @@ class STData(DataContainer):
             ls_ri = size / 2
         if defoci_ss is None:
             defoci_ss = defoci_fs.copy()
+        size = int(size)
         r_vals = []
         extra = {'reference_image': [], 'r_image': []}
-        kernel = np.ones(int(size)) / size
+        st_obj, signs = None, None
         for defocus_fs, defocus_ss in tqdm(zip(defoci_fs.ravel(), defoci_ss.ravel()),
                                            total=len(defoci_fs),
                                            desc='Generating defocus sweep'):
-            st_data = self.update_defocus(defocus_fs, defocus_ss)
-            st_obj = st_data.get_st().update_reference(ls_ri=ls_ri)
-            extra['reference_image'].append(st_obj.reference_image)
-            mean = st_obj.reference_image.copy()
+            if (np.sign(defocus_ss), np.sign(defocus_fs)) != signs:
+                # The pixel mapping depends only on the signs of the defoci,
+                # rebuild the SpeckleTracking object only if they change
+                signs = (np.sign(defocus_ss), np.sign(defocus_fs))
+                st_obj = self.update_defocus(defocus_fs, defocus_ss).get_st()
+                dss_pix, dfs_pix = st_obj.dss_pix * defocus_ss, st_obj.dfs_pix * defocus_fs
+            else:
+                # Pixel translations are inversely proportional to the defocus
+                st_obj.dss_pix, st_obj.dfs_pix = dss_pix / defocus_ss, dfs_pix / defocus_fs
+            st_obj.update_reference.inplace_update(ls_ri=ls_ri)
+            mean = st_obj.reference_image
             mean_sq = st_obj.reference_image**2
-            if st_obj.reference_image.shape[0] > size:
-                mean = fft_convolve(mean, kernel, mode='reflect', axis=0,
-                                    num_threads=self.num_threads)[size // 2:-size // 2]
-                mean_sq = fft_convolve(mean_sq, kernel, mode='reflect', axis=0,
-                                       num_threads=self.num_threads)[size // 2:-size // 2]
-            if st_obj.reference_image.shape[1] > size:
-                mean = fft_convolve(mean, kernel, mode='reflect', axis=1,
-                                    num_threads=self.num_threads)[:, size // 2:-size // 2]
-                mean_sq = fft_convolve(mean_sq, kernel, mode='reflect', axis=1,
-                                       num_threads=self.num_threads)[:, size // 2:-size // 2]
-            r_image = (mean_sq - mean**2) / mean**2
-            extra['r_image'].append(r_image)
+            for axis in range(2):
+                if st_obj.reference_image.shape[axis] > size:
+                    mean = _boxcar_mean(mean, size, axis)
+                    mean_sq = _boxcar_mean(mean_sq, size, axis)
+            # mean_sq is always a new array, calculate R-characteristic in place
+            mean = mean**2
+            r_image = mean_sq
+            r_image -= mean
+            r_image /= mean
             r_vals.append(np.mean(r_image))
+            # Keep the intermediate images only if they are returned
+            if return_extra:
+                extra['reference_image'].append(st_obj.reference_image)
+                extra['r_image'].append(r_image)
         if return_extra:
             return r_vals, extra
         return r_vals
@@ -619,22 +695,33 @@ class STData(DataContainer):
         Returns
         -------
         numpy.ndarray or object
-            `attr` dataset with `mask` and `roi` applied.
+            `attr` dataset with `mask` and `roi` applied. The datasets
+            are copies, modifying them doesn't affect the container.
             `value` if `attr` is not found.
         """
         if attr in self:
             val = super(STData, self).get(attr)
             if not val is None:
-                if attr in ['data', 'error_frame', 'mask', 'phase',
-                            'pixel_aberrations', 'pixel_map', 'whitefield']:
-                    val = np.ascontiguousarray(val[..., self.roi[0]:self.roi[1],
-                                                        self.roi[2]:self.roi[3]])
-                if attr in ['basis_vectors', 'data', 'mask', 'pixel_translations',
-                            'translations']:
-                    val = np.ascontiguousarray(val[self.good_frames])
+                # Apply the ROI and the good frames with a single indexing operation
+                if attr in ['data', 'mask']:
+                    val = self._detach(val[(self._frames,) + self._roi_index], val)
+                elif attr in ['error_frame', 'phase', 'pixel_aberrations', 'pixel_map',
+                              'whitefield']:
+                    val = self._detach(val[(Ellipsis,) + self._roi_index], val)
+                elif attr in ['basis_vectors', 'pixel_translations', 'translations']:
+                    val = self._detach(val[self._frames], val)
             return val
         return value
 
+    @staticmethod
+    def _detach(view, base):
+        # Slicing yields views into the container, copy them so that the
+        # caller can't modify the container's data. Fancy indexing has
+        # already made a copy, which only has to be contiguous
+        if np.may_share_memory(view, base):
+            return np.array(view, order='C')
+        return np.ascontiguousarray(view)
+
     def get_st(self, aberrations=False, ff_correction=False):
         """Return :class:`SpeckleTracking` object derived
         from the container. Return None if `defocus_fs`
@@ -695,14 +782,37 @@ class STData(DataContainer):
             return None
         return AberrationsFit.import_data(self, center=center, axis=axis)
 
-    def get_pca(self):
+    def _masked_data(self, dtype=None):
+        # Select the good frames and the ROI in a single indexing operation,
+        # which yields views for contiguous frames, and multiply by the mask
+        # straight into the output array
+        index = (self._frames,) + self._roi_index
+        return np.multiply(self.data[index], self.mask[index], dtype=dtype)
+
+    def _corrected_data(self, dtype=None):
+        # Masked data with the whitefield subtracted, the subtraction is
+        # performed in place to avoid a second stack-sized temporary
+        data = self._masked_data(dtype)
+        data -= self.get('whitefield')
+        return data
+
+    def get_pca(self, dtype=None):
         """Perform the Principal Component Analysis [PCA]_ of the measured data and
         return a set of eigen flat fields (EFF).
 
+        Parameters
+        ----------
+        dtype : numpy.dtype, optional
+            Precision of the calculations. Single precision
+            (`numpy.float32`) halves the memory footprint and the
+            matrix products cost. The precision of `data` is used
+            by default.
+
         Returns
         -------
         effs_var : numpy.ndarray
-            Variance ratio for each EFF, that it describes.
+            Variance ratio for each EFF, that it describes. Sorted in
+            descending order.
         effs : numpy.ndarray
             Set of eigen flat fields.
 
@@ -713,29 +823,41 @@ class STData(DataContainer):
                  normalization using eigen flat fields in X-ray imaging," Opt. Express
                  23, 27975-27989 (2015).
         """
-        data = self.get('data') * self.get('mask') - self.get('whitefield')
-        mat_svd = np.tensordot(data, data, axes=((1, 2), (1, 2)))
-        eig_vals, eig_vecs = np.linalg.eig(mat_svd)
-        effs = np.tensordot(eig_vecs, data, axes=((0,), (0,)))
+        data = self._corrected_data(dtype)
+        # Flatten the frames to let matmul dispatch straight to BLAS
+        data_2d = data.reshape(data.shape[0], -1)
+        mat_svd = data_2d @ data_2d.T
+        # The Gram matrix is symmetric, sort the EFFs by the variance in
+        # descending order
+        eig_vals, eig_vecs = np.linalg.eigh(mat_svd)
+        eig_vals, eig_vecs = eig_vals[::-1], eig_vecs[:, ::-1]
+        effs = (eig_vecs.T @ data_2d).reshape(data.shape)
         return eig_vals / eig_vals.sum(), effs
 
     @dict_to_object
-    def update_flatfields(self, effs):
+    def update_flatfields(self, effs, dtype=None):
         """Update flatfields based on a set of eigen flat fields `effs`.
 
         Parameters
         ----------
         effs : numpy.ndarray
             Set of the most important eigen flat fields.
+        dtype : numpy.dtype, optional
+            Precision of the calculations. The precision of `data`
+            is used by default.
 
         Returns
         -------
         STData
             New :class:`STData` object with the updated `flatfields`.
         """
-        data = self.get('data') * self.get('mask') - self.get('whitefield')
-        weights = np.tensordot(data, effs, axes=((1, 2), (1, 2))) / np.sum(effs * effs, axis=(1, 2))
-        flatfields = np.tensordot(weights, effs, axes=((1,), (0,))) + self.get('whitefield')
+        data = self._corrected_data(dtype)
+        # Flatten the frames to let matmul dispatch straight to BLAS
+        data_2d = data.reshape(data.shape[0], -1)
+        effs_2d = effs.reshape(effs.shape[0], -1).astype(data.dtype, copy=False)
+        weights = (data_2d @ effs_2d.T) / np.einsum('ij,ij->i', effs_2d, effs_2d)
+        flatfields = (weights @ effs_2d).reshape(data.shape)
+        flatfields += self.get('whitefield')
         return {'flatfields': flatfields}
 
     def write_cxi(self, cxi_file, overwrite=True):
@@ -856,15 +978,19 @@ class SpeckleTracking(DataContainer):
         SpeckleTracking
             A new :class:`SpeckleTracking` object.
         """
-        data = st_data.get('mask') * st_data.get('data')
+        data = st_data._masked_data()
         pixel_map = st_data.get('pixel_map')
         if aberrations:
-            pixel_map += st_data.get('pixel_aberrations')
+            pixel_map = pixel_map + st_data.get('pixel_aberrations')
         whitefield = st_data.get('whitefield')
         if ff_correction:
             flatfields = st_data.get('flatfields')
             if not flatfields is None:
-                data *= np.where(flatfields > 0, whitefield / flatfields, 1.)
+                # Divide only where the flatfields are positive, no division
+                # by zero and no temporary for the full quotient
+                ratio = np.ones(flatfields.shape)
+                np.divide(whitefield, flatfields, out=ratio, where=flatfields > 0)
+                data *= ratio
         dij_pix = np.ascontiguousarray(np.swapaxes(st_data.get('pixel_translations'), 0, 1))
         return cls(data=data, st_data=st_data, dfs_pix=dij_pix[1], dss_pix=dij_pix[0],
                    num_threads=st_data.num_threads, pixel_map=pixel_map,
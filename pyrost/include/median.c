@@ -96,6 +96,13 @@ int compare_uint(const void *a, const void *b)
     else return 0;
 }
 
+int compare_ushort(const void *a, const void *b)
+{
+    if (*(unsigned short *)a > *(unsigned short *)b) return 1;
+    else if (*(unsigned short *)a < *(unsigned short *)b) return -1;
+    else return 0;
+}
+
 static void wirthselect(void *data, void *key, int k, int l, int m, size_t size,
     int (*compar)(const void*, const void*))
 {
@@ -118,8 +125,8 @@ static void wirthselect(void *data, void *key, int k, int l, int m, size_t size,
         if (j < k) l = i;
         if (k < i) m = j;
     }
-    
-    key = data + k * size;
+
+    memcpy(key, data + k * size, size);
 }
 
 int median(void *out, void *data, unsigned char *mask, int ndim, size_t *dims, size_t item_size, int axis,
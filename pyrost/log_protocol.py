@@ -11,6 +11,8 @@ Generate the default built-in log protocol:
 """
 import os
 import re
+import itertools
+import functools
 import h5py
 import numpy as np
 from .ini_parser import ROOT_PATH, INIParser
@@ -49,15 +51,36 @@ class LogProtocol(INIParser):
     fmt_dict = {'log_keys': 'str', 'datatypes': 'str'}
     unit_dict = {'percent': 1e-2, 'mm,mdeg': 1e-3, 'µm,um,udeg,µdeg': 1e-6,
                  'nm,ndeg': 1e-9, 'pm,pdeg': 1e-12}
+    # Flattened in the order of unit_dict, which sets the lookup priority
+    _units = {unit: factor for unit_key, factor in unit_dict.items()
+              for unit in unit_key.split(',')}
 
     def __init__(self, log_keys=None, datatypes=None):
-        if log_keys is None:
-            log_keys = self._import_ini(LOG_PROTOCOL)['log_keys']
-        if datatypes is None:
-            datatypes = self._import_ini(LOG_PROTOCOL)['datatypes']
+        if log_keys is None or datatypes is None:
+            # Parse the default protocol once for both of the sections
+            kwargs = self._import_ini(LOG_PROTOCOL)
+            if log_keys is None:
+                log_keys = kwargs['log_keys']
+            if datatypes is None:
+                datatypes = kwargs['datatypes']
         log_keys = {attr: val for attr, val in log_keys.items() if attr in datatypes}
         datatypes = {attr: val for attr, val in datatypes.items() if attr in log_keys}
         super(LogProtocol, self).__init__(log_keys=log_keys, datatypes=datatypes)
+        self._compile_patterns()
+
+    def _compile_patterns(self):
+        # The patterns depend only on the log keys, compile them once
+        # instead of on every parsed log file
+        part_keys = [re.escape(part_key) for part_key, _ in self.log_keys.values()]
+        self._part_re = re.compile('(' + '|'.join(part_keys) + \
+                                   '|--------------------------------)\n*')
+        self._device_re = re.compile(r'Device:.*\n')
+        self._num_re = re.compile(r'[-]*\d+[.]*\d*')
+        # Group the attributes by their sectors
+        self._part_attrs = {}
+        for attr, (part_key, log_key) in self.log_keys.items():
+            attr_re = re.compile(re.escape(log_key) + r'.*\n')
+            self._part_attrs.setdefault(part_key, []).append((attr, log_key, attr_re))
 
     @classmethod
     def import_default(cls, datatypes=None, log_keys=None):
@@ -115,21 +138,22 @@ class LogProtocol(INIParser):
 
     @classmethod
     def _get_unit(cls, key):
-        for unit_key in cls.unit_dict:
-            units = unit_key.split(',')
-            for unit in units:
-                if unit in key:
-                    return cls.unit_dict[unit_key]
-        return 1.
+        return next((factor for unit, factor in cls._units.items() if unit in key), 1.)
 
     @classmethod
     def _has_unit(cls, key):
-        has_unit = False
-        for unit_key in cls.unit_dict:
-            units = unit_key.split(',')
-            for unit in units:
-                has_unit |= (unit in key)
-        return has_unit
+        return any(unit in key for unit in cls._units)
+
+    @staticmethod
+    def _read_header(log_file):
+        # Collect the commented header lines, joining a list avoids the
+        # quadratic cost of growing a string line by line
+        header = []
+        for line in log_file:
+            if not line.startswith('# '):
+                return header, line
+            header.append(line.strip('# '))
+        return header, ''
 
     def load_attributes(self, path):
         """Return attributes' values from a log file at
@@ -149,54 +173,51 @@ class LogProtocol(INIParser):
         if not isinstance(path, str):
             raise ValueError('path must be a string')
         with open(path, 'r') as log_file:
-            log_str = ''
-            for line in log_file:
-                if line.startswith('# '):
-                    log_str += line.strip('# ')
-                else:
-                    break
+            header, _ = self._read_header(log_file)
+        log_str = ''.join(header)
 
         # Divide log into sectors
-        parts_list = [part for part in re.split('(' + \
-                     '|'.join([key[0] for key in self.log_keys.values()]) + \
-                     '|--------------------------------)\n*', log_str) if part]
-
-        # List all the sector names
-        part_keys = [part_key for part_key, _ in self.log_keys.values()]
-
-        # Rearange sectors into a dictionary
-        parts = {}
-        for idx, part in enumerate(parts_list):
-            if part in part_keys:
-                if part == 'Session logged attributes':
-                    attr_keys, attr_vals = parts_list[idx + 1].strip('\n').split('\n')
-                    parts['Session logged attributes'] = ''
-                    for key, val in zip(attr_keys.split(';'), attr_vals.split(';')):
-                        parts['Session logged attributes'] += key + ': ' + val + '\n'
-                else:
-                    val = parts_list[idx + 1]
-                    match = re.search(r'Device:.*\n', val)
-                    if match:
-                        name = match[0].split(': ')[-1][:-1]
-                        parts[part + ', ' + name] = val
+        parts_list = [part for part in self._part_re.split(log_str) if part]
+
+        # Rearange sectors into a dictionary in a single pass, a sector's
+        # body follows its name in the list
+        parts, part_key = {}, None
+        for part in parts_list:
+            if part in self._part_attrs:
+                part_key = part
+                continue
+            if part_key == 'Session logged attributes':
+                attr_keys, attr_vals = part.strip('\n').split('\n')
+                parts[part_key] = (part_key, ''.join(key + ': ' + val + '\n' for key, val
+                                                     in zip(attr_keys.split(';'),
+                                                            attr_vals.split(';'))))
+            elif not part_key is None:
+                match = self._device_re.search(part)
+                if match:
+                    name = match[0].split(': ')[-1][:-1]
+                    parts[part_key + ', ' + name] = (part_key, part)
+            part_key = None
 
         # Populate attributes dictionary
         attr_dict = {part_name: {} for part_name in parts}
-        for part_name, part in parts.items():
-            for attr, [part_key, log_key] in self.log_keys.items():
-                if part_key in part_name:
-                    # Find the attribute's mention and divide it into a key and value pair
-                    match = re.search(log_key + r'.*\n', part)
-                    if match:
-                        raw_str = match[0]
-                        raw_val = raw_str.strip('\n').split(': ')[1]
-                        # Extract a number string
-                        val_num = re.search(r'[-]*\d+[.]*\d*', raw_val)
-                        dtype = self.known_types[self.datatypes[attr]]
-                        attr_dict[part_name][attr] = dtype(val_num[0] if val_num else raw_val)
-                        # Apply unit conversion if needed
-                        if np.issubdtype(dtype, np.floating):
-                            attr_dict[part_name][attr] *= self._get_unit(raw_str)
+        for part_name, (part_key, part) in parts.items():
+            for attr, log_key, attr_re in self._part_attrs[part_key]:
+                # A substring test is much cheaper than a regex search,
+                # run the search only if the key is mentioned
+                if not log_key in part:
+                    continue
+                # Find the attribute's mention and divide it into a key and value pair
+                match = attr_re.search(part)
+                if match:
+                    raw_str = match[0]
+                    raw_val = raw_str.strip('\n').split(': ')[1]
+                    # Extract a number string
+                    val_num = self._num_re.search(raw_val)
+                    dtype = self.known_types[self.datatypes[attr]]
+                    attr_dict[part_name][attr] = dtype(val_num[0] if val_num else raw_val)
+                    # Apply unit conversion if needed
+                    if np.issubdtype(dtype, np.floating):
+                        attr_dict[part_name][attr] *= self._get_unit(raw_str)
         return attr_dict
 
     def load_data(self, path):
@@ -214,41 +235,45 @@ class LogProtocol(INIParser):
             from the log file.
         """
         with open(path, 'r') as log_file:
-            for line in log_file:
-                if line.startswith('# '):
-                    keys_line = line.strip('# ')
-                else:
-                    data_line = line
-                    break
-
-        keys = keys_line.strip('\n').split(';')
-        data_strings = data_line.strip('\n').split(';')
-
-        dtypes = {'names': [], 'formats': []}
-        converters = {}
-        for idx, (key, val) in enumerate(zip(keys, data_strings)):
-            dtypes['names'].append(key)
+            header, line = self._read_header(log_file)
+
+            # Read the table as strings without any Python converters, which
+            # keeps numpy on its C parser, and convert whole columns afterwards
+            columns = np.loadtxt(itertools.chain([line], log_file), delimiter=';',
+                                 dtype=str, unpack=True, ndmin=2)
+
+        keys = header[-1].strip('\n').split(';')
+
+        data = {}
+        for key, column in zip(keys, columns):
             unit = self._get_unit(key)
-            if 'float' in key:
-                dtypes['formats'].append(np.float_)
-                converters[idx] = lambda item, unit=unit: unit * float(item)
+            if 'float' in key or ('int' in key and self._has_unit(key)):
+                data[key] = unit * column.astype(np.float64)
             elif 'int' in key:
-                if self._has_unit(key):
-                    converters[idx] = lambda item, unit=unit: unit * float(item)
-                    dtypes['formats'].append(np.float_)
-                else:
-                    dtypes['formats'].append(np.int)
+                data[key] = column.astype(np.int64)
             elif 'Array' in key:
-                dtypes['formats'].append(np.ndarray)
-                converters[idx] = lambda item, unit=unit: np.array([float(part.strip(b' []')) * unit
-                                                                    for part in item.split(b',')])
+                # The arrays may differ in length from row to row, parse
+                # every row in C without a Python float per element
+                data[key] = np.empty(column.size, dtype=object)
+                for idx, row in enumerate(np.char.strip(column, ' []')):
+                    data[key][idx] = unit * np.fromstring(row, sep=',')
             else:
-                dtypes['formats'].append('<S' + str(len(val)))
-                converters[idx] = lambda item: item.strip(b' []')
+                data[key] = np.char.encode(np.char.strip(column, ' []'))
+        return data
+
+@functools.lru_cache(maxsize=None)
+def _sigray_loader(datatype):
+    # The protocols are constant, build them once for all the converted scans
+    h5_prt = CXIProtocol(default_paths={'data': 'entry/instrument/detector/data',
+                                        'x_pixel_size': 'entry/instrument/detector/x_pixel_size',
+                                        'y_pixel_size': 'entry/instrument/detector/y_pixel_size'},
+                         datatypes={'data': datatype, 'x_pixel_size': 'float',
+                                    'y_pixel_size': 'float'})
+    return CXILoader(h5_prt)
 
-        return dict(zip(keys, np.loadtxt(path, delimiter=';',
-                                         converters=converters,
-                                         dtype=dtypes, unpack=True)))
+@functools.lru_cache(maxsize=1)
+def _sigray_log_protocol():
+    return LogProtocol()
 
 def cxi_converter_sigray(scan_num, target='Mo', distance=None, lens='up'):
     """Convert measured frames and log files from the
@@ -275,24 +300,19 @@ def cxi_converter_sigray(scan_num, target='Mo', distance=None, lens='up'):
     wl_dict = {'Mo': 7.092917530503447e-11, 'Cu': 1.5498024804150033e-10,
                'Rh': 6.137831605603974e-11}
 
-    h5_prt = CXIProtocol(default_paths={'data': 'entry/instrument/detector/data',
-                                        'x_pixel_size': 'entry/instrument/detector/x_pixel_size',
-                                        'y_pixel_size': 'entry/instrument/detector/y_pixel_size'},
-                         datatypes={'data': 'float', 'x_pixel_size': 'float',
-                                    'y_pixel_size': 'float'})
     cxi_prt = CXIProtocol()
-    log_prt = LogProtocol()
-    cxi_loader = CXILoader(h5_prt)
+    log_prt = _sigray_log_protocol()
+    cxi_loader = _sigray_loader('float')
 
     ss_vec = np.array([0., -1., 0.])
     fs_vec = np.array([-1., 0., 0.])
 
     log_path = f'/gpfs/cfel/cxi/labs/MLL-Sigray/scan-logs/Scan_{scan_num:d}.log'
     dir_path = f'/gpfs/cfel/cxi/labs/MLL-Sigray/scan-frames/Scan_{scan_num:d}'
-    h5_files = sorted([os.path.join(dir_path, path) for path in os.listdir(dir_path)
-                       if path.endswith('Lambda.nxs')])
+    h5_files = sorted(entry.path for entry in os.scandir(dir_path)
+                      if entry.name.endswith('Lambda.nxs'))
 
-    data = np.concatenate(list(cxi_loader.load_data(h5_files).values()), axis=-3)
+    data = cxi_loader.load_frames(h5_files)
     attrs = cxi_loader.load_attributes(h5_files[0])
     log_attrs = log_prt.load_attributes(log_path)
     log_data = log_prt.load_data(log_path)
@@ -349,24 +369,19 @@ def tilt_converter_sigray(scan_num, out_path, target='Mo', distance=2.):
     sum_axis = {'Yaw-LENSE-UP': 0, 'Pitch-LENSE-UP': 1,
                 'Yaw-LENSE-DOWN': 0, 'Pitch-LENSE-DOWN': 1}
 
-    h5_prt = CXIProtocol(default_paths={'data': 'entry/instrument/detector/data',
-                                        'x_pixel_size': 'entry/instrument/detector/x_pixel_size',
-                                        'y_pixel_size': 'entry/instrument/detector/y_pixel_size'},
-                         datatypes={'data': 'float', 'x_pixel_size': 'float',
-                                    'y_pixel_size': 'float'})
-    log_prt = LogProtocol()
-    cxi_loader = CXILoader(h5_prt)
+    log_prt = _sigray_log_protocol()
+    # Lambda counts are integer, load them as is instead of at the float precision
+    cxi_loader = _sigray_loader('uint')
 
     log_path = f'/gpfs/cfel/cxi/labs/MLL-Sigray/scan-logs/Scan_{scan_num:d}.log'
     dir_path = f'/gpfs/cfel/cxi/labs/MLL-Sigray/scan-frames/Scan_{scan_num:d}'
-    h5_files = sorted([os.path.join(dir_path, path) for path in os.listdir(dir_path)
-                       if path.endswith('Lambda.nxs')])
+    h5_files = sorted(entry.path for entry in os.scandir(dir_path)
+                      if entry.name.endswith('Lambda.nxs'))
 
-    data = np.concatenate(list(cxi_loader.load_data(h5_files).values()), axis=-3)
+    data = cxi_loader.load_frames(h5_files)
     attrs = cxi_loader.load_attributes(h5_files[0])
     log_data = log_prt.load_data(log_path)
 
-    data = np.concatenate(list(cxi_loader.load_data(h5_files).values()), axis=-3)
     n_steps = min(next(iter(log_data.values())).shape[0], data.shape[0])
     data = data[:n_steps]
 
@@ -381,11 +396,13 @@ def tilt_converter_sigray(scan_num, out_path, target='Mo', distance=2.):
             scan_type = [data_type for data_type in log_data if flip_key in data_type][0]
             translations = log_data[scan_type][:n_steps]
             if sum_axis[flip_key]:
-                data = np.sum(data[:, :, db_coord[1] - 10:db_coord[1] + 10], axis=2)
+                data = np.sum(data[:, :, db_coord[1] - 10:db_coord[1] + 10], axis=2,
+                              dtype=np.float64)
                 theta = np.linspace(0, data.shape[1], data.shape[1]) - db_coord[0]
                 theta *= 36e-5 * attrs['x_pixel_size'] / (2 * np.pi * distance)
             else:
-                data = np.sum(data[:, db_coord[0] - 10:db_coord[0] + 10], axis=1)
+                data = np.sum(data[:, db_coord[0] - 10:db_coord[0] + 10], axis=1,
+                              dtype=np.float64)
                 theta = np.linspace(data.shape[1], 0, data.shape[1]) - db_coord[1]
                 theta *= 36e-5 * attrs['y_pixel_size'] / (2 * np.pi * distance)
             if flip_dict[flip_key]:
@@ -12,9 +12,15 @@ else:
     USE_CYTHON = True
 
 ext = '.pyx' if USE_CYTHON else '.c'
+compile_args = ['-fopenmp', '-std=c99', '-O3', '-funroll-loops', '-flto']
+link_args = ['-lgomp', '-Wl,-rpath,/usr/local/lib', '-flto']
+# Tune the extensions for the build machine only on request,
+# the resulting binaries are not portable
+if os.environ.get('PYROST_NATIVE', '0') == '1':
+    compile_args.append('-march=native')
 extension_args = {'language': 'c',
-                  'extra_compile_args': ['-fopenmp', '-std=c99'],
-                  'extra_link_args': ['-lgomp', '-Wl,-rpath,/usr/local/lib'],
+                  'extra_compile_args': compile_args,
+                  'extra_link_args': link_args,
                   'libraries': ['gsl', 'gslcblas', 'fftw3', 'fftw3_omp'],
                   'library_dirs': ['/usr/local/lib',
                                    os.path.join(sys.prefix, 'lib')],
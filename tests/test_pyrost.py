@@ -1,9 +1,14 @@
 import os
 import shutil
 from datetime import datetime
+import h5py
+import numpy as np
 import pytest
+from scipy import ndimage
+from scipy.optimize import least_squares
 import pyrost as rst
 import pyrost.simulation as st_sim
+from pyrost.aberrations_fit import LeastSquares
 
 @pytest.fixture(params=[{'det_dist': 5e5, 'n_frames': 10, 'ap_x': 4,
                          'ap_y': 1, 'focus': 3e3, 'defocus': -2e2},
@@ -57,6 +62,35 @@ def ini_path(temp_dir):
     yield path
     os.remove(path)
 
+@pytest.fixture
+def st_frames():
+    """Return a small data container with random frames and a random mask.
+    """
+    rng = np.random.default_rng(0)
+    shape = (4, 8, 10)
+    mask = rng.random(shape) > 0.3
+    mask[0, :2, :2] = False
+    basis_vectors = np.tile([[1e-5, 0., 0.], [0., 1e-5, 0.]], (shape[0], 1, 1))
+    return rst.STData(rst.CXIProtocol(), basis_vectors=basis_vectors, data=rng.random(shape),
+                      distance=1., mask=mask, translations=np.zeros((shape[0], 3)),
+                      wavelength=1e-10, x_pixel_size=1e-5, y_pixel_size=1e-5)
+
+@pytest.fixture
+def cxi_paths(temp_dir):
+    """Return paths to CXI files with random frames of different length.
+    """
+    rng = np.random.default_rng(0)
+    paths = []
+    for index, n_frames in enumerate([3, 5, 2]):
+        path = os.path.join(temp_dir, 'frames_{:d}.cxi'.format(index))
+        with h5py.File(path, 'w') as cxi_file:
+            cxi_file.create_dataset('/entry_1/data_1/data', data=rng.integers(0, 100,
+                                    size=(n_frames, 4, 6), dtype=np.uint16))
+        paths.append(path)
+    yield paths
+    for path in paths:
+        os.remove(path)
+
 @pytest.mark.st_sim
 def test_st_params(st_params, ini_path):
     assert not os.path.isfile(ini_path)
@@ -123,3 +157,163 @@ def test_full(converter, ptych, sim_obj):
     assert (st_obj.pixel_map != st_res.pixel_map).any()
     assert st_res.pixel_map.dtype == converter.protocol.known_types['float']
     assert not fit is None
+
+@pytest.mark.rst
+@pytest.mark.parametrize('loss', ['linear', 'cauchy', 'soft_l1'])
+def test_least_squares_jac(loss):
+    x = np.linspace(-1., 1., 101)
+    y = np.polyval([0.5, -2., 1.], x) + 0.1 * np.sin(50. * x)
+    y[::10] += 5.
+    fit, err, _ = LeastSquares.fit(x, y, max_order=2, loss=loss)
+    ref = least_squares(LeastSquares.errors, np.zeros(3), loss=loss, args=(x, y, (0, x.size)),
+                        xtol=1e-14, ftol=1e-14)
+    cov = np.linalg.inv(ref.jac.T.dot(ref.jac))
+    ref_err = np.sqrt(np.sum(ref.fun**2) / (ref.fun.size - ref.x.size) * np.abs(np.diag(cov)))
+    assert np.allclose(fit, ref.x)
+    assert np.allclose(err, ref_err, rtol=1e-5)
+
+@pytest.mark.rst
+def test_load_data(temp_dir):
+    path = os.path.join(temp_dir, 'test.log')
+    lines = ['# Session logged attributes\n',
+             '# Timestamp, str;X-SAM, um, float;Counter, int;Slit, nm, int;Vals, mm, Array\n',
+             '2020-01-01T00;1.5;3;4;[1.0, 2.0, 3.0]\n',
+             '2020-01-02T00;2.5;4;5;[4.0, 5.0]\n']
+    log_prt = rst.LogProtocol()
+    for n_rows in [1, 2]:
+        with open(path, 'w') as log_file:
+            log_file.writelines(lines[:2 + n_rows])
+        data = log_prt.load_data(path)
+        assert np.all(data['Timestamp, str'] == [b'2020-01-01T00', b'2020-01-02T00'][:n_rows])
+        assert np.allclose(data['X-SAM, um, float'], [1.5e-6, 2.5e-6][:n_rows])
+        assert data['Counter, int'].dtype == np.int64
+        assert np.all(data['Counter, int'] == [3, 4][:n_rows])
+        assert np.allclose(data['Slit, nm, int'], [4e-9, 5e-9][:n_rows])
+        assert data['Vals, mm, Array'].size == n_rows
+        assert np.allclose(data['Vals, mm, Array'][0], [1e-3, 2e-3, 3e-3])
+        if n_rows > 1:
+            assert np.allclose(data['Vals, mm, Array'][1], [4e-3, 5e-3])
+    os.remove(path)
+
+@pytest.mark.rst
+def test_bin_data(st_frames):
+    binned = st_frames.bin_data(bin_ratio=2)
+    data = st_frames.data.reshape(4, 4, 2, 5, 2)
+    mask = st_frames.mask.reshape(4, 4, 2, 5, 2)
+    counts = np.sum(mask, axis=(2, 4))
+    assert not binned.mask[0, 0, 0]
+    assert np.all(binned.mask == (counts > 0))
+    assert np.allclose(binned.data[counts > 0], np.sum(data * mask, axis=(2, 4))[counts > 0] / \
+                       counts[counts > 0])
+    assert np.all(binned.data[counts == 0] == 0)
+
+@pytest.mark.rst
+def test_update_mask_method(st_frames):
+    with pytest.raises(ValueError):
+        st_frames.update_mask(method='invalid')
+
+@pytest.mark.rst
+def test_get_pca(st_frames):
+    effs_var, effs = st_frames.get_pca()
+    assert effs.shape == st_frames.get('data').shape
+    assert np.all(np.diff(effs_var) <= 0.)
+    assert np.isclose(np.sum(effs_var), 1.)
+    effs_var32, effs32 = st_frames.get_pca(dtype=np.float32)
+    assert effs_var32.dtype == np.float32 and effs32.dtype == np.float32
+    assert np.allclose(effs_var32, effs_var, atol=1e-5)
+
+@pytest.mark.rst
+def test_defocus_sweep(converter, ptych, sim_obj):
+    st_data = converter.export_data(ptych, sim_obj)
+    defoci = st_data.defocus_fs * np.array([-1.2, -1., 0.8, 1., 1.2])
+    size = 21
+    r_vals, extra = st_data.defocus_sweep(defoci, size=size, return_extra=True)
+    kernel = np.ones(size) / size
+    for defocus, r_val, ref_image, r_image in zip(defoci, r_vals, extra['reference_image'],
+                                                  extra['r_image']):
+        st_obj = st_data.update_defocus(defocus).get_st().update_reference(ls_ri=size / 2)
+        # The pixel translations are rescaled instead of recalculated, the
+        # results agree up to the precision of the protocol's float type
+        assert np.allclose(ref_image, st_obj.reference_image, rtol=1e-4)
+        mean = st_obj.reference_image.astype(np.float64)
+        mean_sq = mean**2
+        for axis in range(2):
+            if mean.shape[axis] > size:
+                index = np.arange(size // 2, mean.shape[axis] - size // 2 - 1)
+                mean = rst.bin.fft_convolve(mean, kernel, mode='reflect',
+                                            axis=axis).take(index, axis=axis)
+                mean_sq = rst.bin.fft_convolve(mean_sq, kernel, mode='reflect',
+                                               axis=axis).take(index, axis=axis)
+        r_ref = (mean_sq - mean**2) / mean**2
+        assert np.allclose(r_image, r_ref, rtol=1e-3, atol=1e-3 * np.abs(r_ref).max())
+        assert np.isclose(r_val, np.mean(r_ref), rtol=1e-3)
+
+@pytest.mark.rst
+@pytest.mark.parametrize('idxs', [[0, 1, 2, 3, 4], [3, 0, 4, 1], [2, 2, 0, 3, 3]])
+def test_read_runs(loader, cxi_paths, idxs):
+    with h5py.File(cxi_paths[1], 'r') as cxi_file:
+        frames = cxi_file['/entry_1/data_1/data'][()]
+        data = loader.read_cxi('data', cxi_file, idxs=np.array(idxs))
+    assert data.dtype == loader.get_dtype('data')
+    assert np.all(data == frames[idxs])
+
+@pytest.mark.rst
+def test_read_group(loader, temp_dir):
+    path = os.path.join(temp_dir, 'group.cxi')
+    frames = np.random.default_rng(1).random((2, 3, 4, 5))
+    with h5py.File(path, 'w') as cxi_file:
+        for index, dset in enumerate(frames):
+            cxi_file.create_dataset('/entry_1/data_1/data/data_{:d}'.format(index), data=dset)
+    with h5py.File(path, 'r') as cxi_file:
+        data = loader.read_cxi('data', cxi_file)
+        data_idxs = loader.read_cxi('data', cxi_file, idxs=[np.array([2, 0]), np.array([1, 2])])
+    os.remove(path)
+    assert data.dtype == loader.get_dtype('data')
+    assert np.all(data == frames.astype(loader.get_dtype('data')))
+    assert np.all(data_idxs == np.stack([frames[0, [2, 0]], frames[1, [1, 2]]]).astype(data.dtype))
+
+@pytest.mark.rst
+def test_load_frames_bool(loader, temp_dir):
+    paths = [os.path.join(temp_dir, 'bool_{:d}.cxi'.format(index)) for index in range(2)]
+    frames = np.random.default_rng(2).random((5, 4, 6)) > 0.5
+    for path, dset in zip(paths, np.split(frames, [2,])):
+        with h5py.File(path, 'w') as cxi_file:
+            cxi_file.create_dataset('/entry_1/data_1/data', data=dset)
+    data = loader.load_frames(paths)
+    for path in paths:
+        os.remove(path)
+    assert data.dtype == loader.get_dtype('data')
+    assert np.all(data == frames)
+
+@pytest.mark.rst
+def test_load_to_dict_frames(loader, cxi_paths):
+    data_dict = loader.load_to_dict(paths=cxi_paths)
+    data = np.concatenate(list(loader.load_data(cxi_paths).values()), axis=-3)
+    assert data_dict['data'].dtype == data.dtype
+    assert np.all(data_dict['data'] == data)
+    assert np.all(loader.load_to_dict(paths=cxi_paths[0])['data'] == \
+                  loader.load_data(cxi_paths[0])[cxi_paths[0]])
+
+@pytest.mark.rst
+def test_median_uint16():
+    # Odd number of points, the median is a single element of the data
+    data = np.random.default_rng(3).integers(0, 1000, size=(11, 7, 9), dtype=np.uint16)
+    median = rst.bin.median(data, axis=0)
+    assert median.dtype == np.uint16
+    assert np.all(median == np.median(data, axis=0))
+    filtered = rst.bin.median_filter(data, size=3, mode='reflect')
+    assert filtered.dtype == np.uint16
+    assert np.all(filtered == ndimage.median_filter(data, size=3, mode='reflect'))
+
+@pytest.mark.rst
+def test_fftw_wisdom():
+    inp = rst.bin.empty_aligned(128, dtype='complex128')
+    out = rst.bin.empty_aligned(128, dtype='complex128')
+    rst.bin.FFTW(inp, out, flags=('FFTW_MEASURE',))
+    wisdom = rst.bin.export_wisdom()
+    assert isinstance(wisdom, bytes)
+    rst.bin.forget_wisdom()
+    with pytest.raises(RuntimeError):
+        rst.bin.FFTW(inp, out, flags=('FFTW_WISDOM_ONLY',))
+    assert rst.bin.import_wisdom(wisdom)
+    rst.bin.FFTW(inp, out, flags=('FFTW_WISDOM_ONLY',))